@@ -12,9 +12,12 @@ import shutil
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Callable
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple, Optional, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict
+from functools import lru_cache
+from itertools import chain, repeat
+import queue
 import threading
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk, messagebox
@@ -279,52 +282,71 @@ class MessageParser:
                    progress_callback: Optional[Callable] = None) -> ParseResult:
         """Parse WhatsApp chat file"""
         
+        unmatched_blocks = []
+        entries = list(self.iter_entries(file_path, error_logger, progress_callback, unmatched_blocks.append))
+        
+        return ParseResult(
+            entries=entries,
+            skipped_count=len(unmatched_blocks),
+            unmatched_blocks=unmatched_blocks
+        )
+    
+    def iter_entries(self,
+                     file_path: str,
+                     error_logger: Optional[Callable] = None,
+                     progress_callback: Optional[Callable] = None,
+                     unmatched_callback: Optional[Callable] = None,
+                     progress_range: Tuple[int, int] = (20, 60)) -> Iterator[Dict]:
+        """Parse WhatsApp chat file, yielding each entry as soon as it is parsed"""
+        
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
         
         raw_blocks = self.REFUEL_SPLIT.split(content)[1:]
-        entries = []
-        unmatched_blocks = []
+        del content
+        parsed_count = 0
         skipped_count = 0
         total_blocks = len(raw_blocks)
+        progress_start, progress_end = progress_range
+        last_progress = None
         
         for block_idx, block in enumerate(raw_blocks):
             if progress_callback:
-                progress = int((block_idx / total_blocks) * 40) + 20
-                progress_callback(progress)
+                progress = int((block_idx / total_blocks) * (progress_end - progress_start)) + progress_start
+                # Large chat files only report when the percentage actually moves
+                if progress != last_progress:
+                    progress_callback(progress)
+                    last_progress = progress
             
             result = self._parse_block(block, block_idx)
             
             if result is None:
                 skipped_count += 1
-                unmatched_blocks.append({
-                    'reason': 'Parse failed',
-                    'content': block
-                })
+                if unmatched_callback:
+                    unmatched_callback({
+                        'reason': 'Parse failed',
+                        'content': block
+                    })
                 if error_logger:
                     error_logger(f"❌ Block {block_idx + 1}: Parse failed")
                 continue
             
             if 'error' in result:
                 skipped_count += 1
-                unmatched_blocks.append({
-                    'reason': result['error'],
-                    'content': block
-                })
+                if unmatched_callback:
+                    unmatched_callback({
+                        'reason': result['error'],
+                        'content': block
+                    })
                 if error_logger:
                     error_logger(f"❌ Block {block_idx + 1}: {result['error']}")
                 continue
             
-            entries.append(result)
+            parsed_count += 1
             logging.info(f"✅ Block {block_idx + 1}: Parsed {result.get('SITE ID', 'Unknown')}")
+            yield result
         
-        logging.info(f"📊 Summary: {len(entries)} valid entries parsed, {skipped_count} skipped")
-        
-        return ParseResult(
-            entries=entries,
-            skipped_count=skipped_count,
-            unmatched_blocks=unmatched_blocks
-        )
+        logging.info(f"📊 Summary: {parsed_count} valid entries parsed, {skipped_count} skipped")
     
     def _parse_block(self, block: str, block_idx: int) -> Optional[Dict]:
         """Parse a single message block"""
@@ -404,13 +426,22 @@ class MessageParser:
 
 @dataclass
 class SheetInfo:
-    """Information about an Excel sheet"""
+    """
+    Information about an Excel sheet.
+    
+    existing_keys holds (str(CURRENT VISIT DATE), str(CURRENT DG RUN HOURS)) for every
+    row with a SITE ID. It is built once by ExcelManager.get_sheet_info and is a set, so
+    duplicate checks are O(1); DataUpdater adds the key of each row it writes.
+    """
     worksheet: Worksheet
     header_row: int
     headers: List[str]
     col_map: Dict[str, int]
     last_date: datetime
-    existing_keys: set
+    last_date_str: str
+    existing_keys: Set[Tuple[str, str]]
+    next_write_row: int = 0
+    append_rows: bool = False  # True when nothing sits below next_write_row, so ws.append() lands there
 
 
 class ExcelManager:
@@ -428,73 +459,76 @@ class ExcelManager:
         shutil.copy(self.config.excel_file, backup_path)
         logging.info(f"✅ Backup created: {backup_path.name}")
     
-    def load_workbook(self):
-        """Load the Excel workbook"""
-        return load_workbook(self.config.excel_file)
+    def load_workbook(self, read_only: bool = False):
+        """Load the Excel workbook (read-only workbooks stream rows and cannot be edited)"""
+        return load_workbook(self.config.excel_file, read_only=read_only)
     
-    def get_sheet_info(self, ws: Worksheet) -> Optional[SheetInfo]:
-        """Extract information about a worksheet"""
-        
-        # Find header row
-        header_row = None
-        headers = []
+    def find_header_row(self, ws) -> Optional[Tuple[int, List[str]]]:
+        """Find the header row in the first 20 rows, returning (row number, headers)"""
+        required_headers = ["SITE ID", "CURRENT VISIT DATE", "CURRENT DG RUN HOURS", "NAME OF TECHNICIAN"]
         
-        for row in ws.iter_rows(min_row=1, max_row=20):
-            values = [str(cell.value or "").strip().upper() for cell in row]
-            required_headers = ["SITE ID", "CURRENT VISIT DATE", "CURRENT DG RUN HOURS", "NAME OF TECHNICIAN"]
+        for row_idx, row in enumerate(ws.iter_rows(min_row=1, max_row=20, values_only=True), 1):
+            values = [str(value or "").strip().upper() for value in row]
             
             if all(any(k in v for v in values) for k in required_headers):
-                header_row = row[0].row
-                headers = [str(cell.value or "").strip() for cell in row]
-                break
+                return row_idx, [str(value or "").strip() for value in row]
         
-        if not header_row:
+        return None
+    
+    def get_sheet_info(self, ws: Worksheet) -> Optional[SheetInfo]:
+        """Extract information about a worksheet"""
+        
+        # Find header row
+        header = self.find_header_row(ws)
+        if not header:
             return None
         
+        header_row, headers = header
+
         # Normalize column names to uppercase for consistent matching
         col_map = {}
         for idx, name in enumerate(headers):
             normalized_name = name.strip().upper()
             col_map[normalized_name] = idx + 1
         
-        # Find last date
         date_col = col_map.get("CURRENT VISIT DATE")
         if not date_col:
             return None
+        site_col = col_map["SITE ID"]
+        dg_col = col_map["CURRENT DG RUN HOURS"]
+        
+        # Find last date and build existing keys in a single pass over the data rows
         last_date = datetime.min
+        existing_keys = set()
         
-        for r in range(header_row + 1, ws.max_row + 1):
-            cell = ws.cell(row=r, column=date_col)
-            if cell.value is None:
+        rows = ws.iter_rows(min_row=header_row + 1, max_col=max(site_col, date_col, dg_col), values_only=True)
+        for values in rows:
+            date_value = values[date_col - 1]
+            
+            if values[site_col - 1]:
+                existing_keys.add((str(date_value), str(values[dg_col - 1])))
+            
+            if date_value is None:
                 continue
             
-            if isinstance(cell.value, datetime):
-                dt = cell.value
+            if isinstance(date_value, datetime):
+                dt = date_value
             else:
                 try:
-                    dt = datetime.strptime(str(cell.value).strip(), "%d/%m/%Y")
+                    dt = datetime.strptime(str(date_value).strip(), "%d/%m/%Y")
                 except ValueError:
                     continue
             
             if dt > last_date:
                 last_date = dt
-        
-        # Build existing keys
-        site_col = col_map["SITE ID"]
-        dg_col = col_map["CURRENT DG RUN HOURS"]
-        date_col = col_map.get("CURRENT VISIT DATE")
-        existing_keys = {
-            (str(ws.cell(row=r, column=date_col).value), str(ws.cell(row=r, column=dg_col).value))
-            for r in range(header_row + 1, ws.max_row + 1)
-            if ws.cell(row=r, column=site_col).value
-        }
-        
+
         return SheetInfo(
             worksheet=ws,
             header_row=header_row,
             headers=headers,
             col_map=col_map,
             last_date=last_date,
+            last_date_str=last_date.strftime("%d/%m/%Y"),
             existing_keys=existing_keys
         )
     
@@ -536,6 +570,69 @@ class PropagationResult:
     dg_hours_filled: int = 0
 
 
+# (target, source) positions in a site row tuple, in DataPropagator.FILLED_COLUMNS order:
+# PREVIOUS VISIT DATE <- CURRENT VISIT DATE, PREVIOUS DIESEL LEVEL <- FUEL LEFT ON SITE,
+# PREVIOUS DG RUN HOURS <- CURRENT DG RUN HOURS
+_FILL_SPECS = ((1, 2), (3, 4), (5, 6))
+
+
+def _forward_fill(targets: Tuple, sources: Tuple) -> List[Tuple[int, Any]]:
+    """
+    Fill empty targets with the last non-empty source value of the previous rows.
+    
+    Until a source value has been seen, an empty target is filled from its own row.
+    Returns (index, value) pairs for the targets that were filled.
+    """
+    fills = []
+    last_source = None
+    
+    for idx, (target, source) in enumerate(zip(targets, sources)):
+        if target is None:
+            value = source if last_source is None else last_source
+            if value is not None:
+                fills.append((idx, value))
+        
+        if source is not None:
+            last_source = source
+    
+    return fills
+
+
+def _compute_fills_for_site(rows: List[Tuple]) -> Tuple[Dict[str, int], List[Tuple[int, int, Any]]]:
+    """
+    Compute the fills for all rows of a specific site.
+    
+    Works only on plain row tuples, independent of openpyxl objects.
+    Returns the fill counts and the (row, FILLED_COLUMNS index, value) writes.
+    """
+    
+    # Work column by column rather than row by row
+    columns = list(zip(*rows))
+    row_numbers = columns[0]
+    
+    writes = []
+    updated_rows = set()
+    fill_counts = [0] * len(_FILL_SPECS)
+    
+    for slot, (target, source) in enumerate(_FILL_SPECS):
+        fills = _forward_fill(columns[target], columns[source])
+        fill_counts[slot] = len(fills)
+        
+        for idx, value in fills:
+            row = row_numbers[idx]
+            writes.append((row, slot, value))
+            updated_rows.add(row)
+    
+    dates_filled, diesel_filled, dg_hours_filled = fill_counts
+    counts = {
+        'rows_updated': len(updated_rows),
+        'dates_filled': dates_filled,
+        'diesel_filled': diesel_filled,
+        'dg_hours_filled': dg_hours_filled
+    }
+    return counts, writes
+
+
 class DataPropagator:
     """Propagates previous visit dates and diesel levels across site entries"""
     
@@ -549,6 +646,9 @@ class DataPropagator:
         "CURRENT DG RUN HOURS"
     ]
     
+    # Columns written by propagation; writes refer to them by position
+    FILLED_COLUMNS = ("PREVIOUS VISIT DATE", "PREVIOUS DIESEL LEVEL", "PREVIOUS DG RUN HOURS")
+
     def __init__(self, config: Config):
         self.config = config
         self.excel_manager = ExcelManager(config)
@@ -567,47 +667,88 @@ class DataPropagator:
         3. For subsequent rows:
            - If PREVIOUS VISIT DATE is empty, copy CURRENT VISIT DATE from previous row
            - If PREVIOUS DIESEL LEVEL is empty, copy FUEL LEFT ON SITE from previous row
+        
+        The sheets are scanned through a read-only workbook and the fills are computed
+        in memory; the workbook is then reopened for editing and only the filled cells
+        are written.
         """
         
         logging.info("🔄 Starting data propagation process...")
-        self.excel_manager.backup_file()
-        
-        wb = self.excel_manager.load_workbook()
-        
+
         # Determine which sheets to process
         if sheet_names is None:
             sheet_names = [self.config.fuel_sheet, self.config.ms_sheet]
         
+        # Pass 1: read values and compute fills
+        pending = {}
+        wb = self.excel_manager.load_workbook(read_only=True)
+        
+        try:
+            for sheet_name in sheet_names:
+                if sheet_name not in wb.sheetnames:
+                    logging.warning(f"⚠️ Sheet '{sheet_name}' not found, skipping...")
+                    continue
+                
+                grouped = self._group_by_site(wb[sheet_name])
+                
+                if grouped is None:
+                    logging.warning(f"⚠️ Could not get info for sheet '{sheet_name}', skipping...")
+                    continue
+                
+                site_rows, has_empty = grouped
+                
+                if not has_empty:
+                    logging.info(f"✅ Sheet '{sheet_name}': nothing to propagate")
+                    pending[sheet_name] = (PropagationResult(
+                        sites_processed=len(site_rows),
+                        rows_updated=0,
+                        dates_filled=0,
+                        diesel_levels_filled=0
+                    ), [])
+                    continue
+                
+                logging.info(f"📋 Processing sheet: {sheet_name}")
+                
+                # Process this sheet
+                pending[sheet_name] = self._process_sheet(site_rows, progress_callback)
+        finally:
+            wb.close()
+        
+        # Pass 2: write the filled cells; the workbook is only opened if there is something to write
+        wb = None
+        dirty = False
+        
         total_sites_processed = 0
         total_rows_updated = 0
         total_dates_filled = 0
         total_diesel_filled = 0
         total_dg_hours_filled = 0
         
-        for sheet_name in sheet_names:
-            if sheet_name not in wb.sheetnames:
-                logging.warning(f"⚠️ Sheet '{sheet_name}' not found, skipping...")
-                continue
-            
-            ws = wb[sheet_name]
-            sheet_info = self.excel_manager.get_sheet_info(ws)
-            
-            if not sheet_info:
-                logging.warning(f"⚠️ Could not get info for sheet '{sheet_name}', skipping...")
-                continue
-            
-            # Ensure required columns exist - create them if missing
-            sheet_info = self._ensure_required_columns(sheet_info, ws)
-            
-            if not self._validate_columns(sheet_info):
-                logging.warning(f"⚠️ Sheet '{sheet_name}' missing required columns, skipping...")
-                continue
-            
-            logging.info(f"📋 Processing sheet: {sheet_name}")
-            
-            # Process this sheet
-            result = self._process_sheet(sheet_info, progress_callback)
-            
+        for sheet_name, (result, writes) in pending.items():
+            if writes:
+                if wb is None:
+                    wb = self.excel_manager.load_workbook()
+                
+                ws = wb[sheet_name]
+                sheet_info = self.excel_manager.get_sheet_info(ws)
+                
+                if not sheet_info:
+                    logging.warning(f"⚠️ Could not get info for sheet '{sheet_name}', skipping...")
+                    continue
+                
+                # Ensure required columns exist - create them if missing
+                sheet_info = self._ensure_required_columns(sheet_info, ws)
+                
+                if not self._validate_columns(sheet_info):
+                    logging.warning(f"⚠️ Sheet '{sheet_name}' missing required columns, skipping...")
+                    continue
+                
+                # Resolve the target columns once for the whole sheet
+                fill_cols = tuple(sheet_info.col_map[name] for name in self.FILLED_COLUMNS)
+                for row, slot, value in writes:
+                    ws.cell(row=row, column=fill_cols[slot]).value = value
+                dirty = True
+
             total_sites_processed += result.sites_processed
             total_rows_updated += result.rows_updated
             total_dates_filled += result.dates_filled
@@ -616,9 +757,13 @@ class DataPropagator:
             
             logging.info(f"✅ Sheet '{sheet_name}': {result.sites_processed} sites, {result.rows_updated} rows updated")
         
-        # Save workbook
-        wb.save(self.config.excel_file)
-        logging.info(f"💾 Excel file saved successfully")
+        # Back up and save only if cells were written
+        if dirty:
+            self.excel_manager.backup_file()
+            wb.save(self.config.excel_file)
+            logging.info(f"💾 Excel file saved successfully")
+        else:
+            logging.info("✅ Nothing to propagate, Excel file left unchanged")
         logging.info(f"📊 Propagation Summary: {total_sites_processed} sites | {total_rows_updated} rows | "
                     f"{total_dates_filled} dates | {total_diesel_filled} diesel levels | {total_dg_hours_filled} DG hours")
         
@@ -640,10 +785,9 @@ class DataPropagator:
         
         if columns_to_add:
             logging.info(f"➕ Adding missing columns: {columns_to_add}")
-            excel_manager = ExcelManager(self.config)
             
             for col_name in columns_to_add:
-                sheet_info = excel_manager.ensure_column_exists(sheet_info, col_name)
+                sheet_info = self.excel_manager.ensure_column_exists(sheet_info, col_name)
         
         return sheet_info
     
@@ -665,31 +809,32 @@ class DataPropagator:
         return True
     
     def _process_sheet(self, 
-                      sheet_info: SheetInfo,
-                      progress_callback: Optional[Callable] = None) -> PropagationResult:
-        """Process a single sheet"""
-        
-        # Group rows by site ID
-        site_rows = self._group_by_site(sheet_info)
+                      site_rows: Dict[str, List[Tuple]],
+                      progress_callback: Optional[Callable] = None) -> Tuple[PropagationResult, List[Tuple[int, int, Any]]]:
+        """Process a single sheet, returning the totals and the (row, FILLED_COLUMNS index, value) writes"""
         
         sites_processed = 0
         rows_updated = 0
         dates_filled = 0
         diesel_filled = 0
         dg_hours_filled = 0
+        writes = []
         
         total_sites = len(site_rows)
+        # Per-row debug messages are only built when DEBUG logging is on
+        debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
         
         for site_idx, (site_id, rows) in enumerate(site_rows.items()):
             if progress_callback:
                 progress = int((site_idx / total_sites) * 30) + 70  # 70-100% range
                 progress_callback(progress)
             
-            # Sort rows by row number to maintain chronological order
-            rows.sort()
-            
             # Process this site's rows
-            result = self._process_site_rows(sheet_info, site_id, rows)
+            result, site_writes = _compute_fills_for_site(rows)
+            writes.extend(site_writes)
+            if debug_enabled:
+                for row, slot, _ in site_writes:
+                    logging.debug("  Row %d: Filled %s", row, self.FILLED_COLUMNS[slot])
             
             sites_processed += 1
             rows_updated += result['rows_updated']
@@ -699,144 +844,52 @@ class DataPropagator:
             
             logging.info(f"✅ Site {site_id}: {result['rows_updated']} rows updated")
         
-        return PropagationResult(
+        result = PropagationResult(
             sites_processed=sites_processed,
             rows_updated=rows_updated,
             dates_filled=dates_filled,
             diesel_levels_filled=diesel_filled,
             dg_hours_filled=dg_hours_filled
         )
+        return result, writes
     
-    def _group_by_site(self, sheet_info: SheetInfo) -> Dict[str, List[int]]:
-        """Group row numbers by site ID"""
-        site_rows = defaultdict(list)
-        
-        site_col = sheet_info.col_map["SITE ID"]
-        
-        for row in range(sheet_info.header_row + 1, sheet_info.worksheet.max_row + 1):
-            site_id = sheet_info.worksheet.cell(row=row, column=site_col).value
-            
-            if site_id:
-                site_rows[str(site_id).strip()].append(row)
-        
-        return dict(site_rows)
-    
-    def _process_site_rows(self, 
-                          sheet_info: SheetInfo, 
-                          site_id: str, 
-                          rows: List[int]) -> Dict[str, int]:
-        """Process all rows for a specific site"""
-        
-        ws = sheet_info.worksheet
-        col_map = sheet_info.col_map
+    def _group_by_site(self, ws) -> Optional[Tuple[Dict[str, List[Tuple]], bool]]:
+        """
+        Group row values by site ID.
         
-        try:
-            prev_date_col = col_map["PREVIOUS VISIT DATE"]
-            curr_date_col = col_map["CURRENT VISIT DATE"]
-            prev_diesel_col = col_map["PREVIOUS DIESEL LEVEL"]
-            fuel_left_col = col_map["FUEL LEFT ON SITE"]
-            prev_dg_col = col_map["PREVIOUS DG RUN HOURS"]
-            curr_dg_col = col_map["CURRENT DG RUN HOURS"]
-        except KeyError as e:
-            logging.error(f"❌ Column not found for site {site_id}: {e}")
-            logging.error(f"Available columns: {list(col_map.keys())}")
-            return {'rows_updated': 0, 'dates_filled': 0, 'diesel_filled': 0, 'dg_hours_filled': 0}
+        Each row is a tuple of (row number, PREVIOUS VISIT DATE, CURRENT VISIT DATE,
+        PREVIOUS DIESEL LEVEL, FUEL LEFT ON SITE, PREVIOUS DG RUN HOURS, CURRENT DG RUN HOURS).
+        Columns missing from the sheet and blank cells read as None.
+        Also returns whether any of the previous-value cells is empty, i.e. whether there
+        can be anything to propagate.
+        """
+        header = self.excel_manager.find_header_row(ws)
+        if not header:
+            return None
         
-        rows_updated = 0
-        dates_filled = 0
-        diesel_filled = 0
-        dg_hours_filled = 0
+        header_row, headers = header
+        col_map = {name.upper(): idx for idx, name in enumerate(headers)}
+        indices = [col_map.get(col) for col in self.REQUIRED_COLUMNS]
         
-        previous_current_date = None
-        previous_fuel_left = None
-        previous_current_dg = None
+        site_rows = defaultdict(list)
+        has_empty = False
         
-        for row in rows:
-            row_modified = False
-            
-            # Get current row values
-            prev_date = ws.cell(row=row, column=prev_date_col).value
-            curr_date = ws.cell(row=row, column=curr_date_col).value
-            prev_diesel = ws.cell(row=row, column=prev_diesel_col).value
-            fuel_left = ws.cell(row=row, column=fuel_left_col).value
-            prev_dg = ws.cell(row=row, column=prev_dg_col).value
-            curr_dg = ws.cell(row=row, column=curr_dg_col).value
-            
-            # Handle PREVIOUS VISIT DATE
-            if self._is_empty(prev_date):
-                if previous_current_date is None:
-                    # First row: copy from CURRENT VISIT DATE
-                    if not self._is_empty(curr_date):
-                        ws.cell(row=row, column=prev_date_col, value=curr_date)
-                        dates_filled += 1
-                        row_modified = True
-                        logging.debug(f"  Row {row}: Filled PREVIOUS VISIT DATE from CURRENT VISIT DATE")
-                else:
-                    # Subsequent rows: copy from previous row's CURRENT VISIT DATE
-                    ws.cell(row=row, column=prev_date_col, value=previous_current_date)
-                    dates_filled += 1
-                    row_modified = True
-                    logging.debug(f"  Row {row}: Filled PREVIOUS VISIT DATE from previous row")
+        # Rows are read top to bottom, so each site's list is already in ascending row
+        # (chronological) order and needs no sorting
+        rows = ws.iter_rows(min_row=header_row + 1, max_col=len(headers), values_only=True)
+        for row, values in enumerate(rows, header_row + 1):
+            site_id, *fields = [values[i] if i is not None else None for i in indices]
             
-            # Handle PREVIOUS DIESEL LEVEL
-            if self._is_empty(prev_diesel):
-                if previous_fuel_left is None:
-                    # First row: copy from FUEL LEFT ON SITE
-                    if not self._is_empty(fuel_left):
-                        ws.cell(row=row, column=prev_diesel_col, value=fuel_left)
-                        diesel_filled += 1
-                        row_modified = True
-                        logging.debug(f"  Row {row}: Filled PREVIOUS DIESEL LEVEL from FUEL LEFT ON SITE")
-                else:
-                    # Subsequent rows: copy from previous row's FUEL LEFT ON SITE
-                    ws.cell(row=row, column=prev_diesel_col, value=previous_fuel_left)
-                    diesel_filled += 1
-                    row_modified = True
-                    logging.debug(f"  Row {row}: Filled PREVIOUS DIESEL LEVEL from previous row")
-            
-            # Handle PREVIOUS DG RUN HOURS
-            if self._is_empty(prev_dg):
-                if previous_current_dg is None:
-                    # First row: copy from CURRENT DG RUN HOURS
-                    if not self._is_empty(curr_dg):
-                        ws.cell(row=row, column=prev_dg_col, value=curr_dg)
-                        dg_hours_filled += 1
-                        row_modified = True
-                        logging.debug(f"  Row {row}: Filled PREVIOUS DG RUN HOURS from CURRENT DG RUN HOURS")
-                else:
-                    # Subsequent rows: copy from previous row's CURRENT DG RUN HOURS
-                    ws.cell(row=row, column=prev_dg_col, value=previous_current_dg)
-                    dg_hours_filled += 1
-                    row_modified = True
-                    logging.debug(f"  Row {row}: Filled PREVIOUS DG RUN HOURS from previous row")
-            
-            # Update tracking variables for next iteration
-            if not self._is_empty(curr_date):
-                previous_current_date = curr_date
-            
-            if not self._is_empty(fuel_left):
-                previous_fuel_left = fuel_left
-            
-            if not self._is_empty(curr_dg):
-                previous_current_dg = curr_dg
-            
-            if row_modified:
-                rows_updated += 1
-        
-        return {
-            'rows_updated': rows_updated,
-            'dates_filled': dates_filled,
-            'diesel_filled': diesel_filled,
-            'dg_hours_filled': dg_hours_filled
-        }
-    
-    def _is_empty(self, value) -> bool:
-        """Check if a cell value is empty"""
-        if value is None:
-            return True
-        if isinstance(value, str) and value.strip() == "":
-            return True
-        return False
+            if site_id:
+                site_id = site_id.strip() if isinstance(site_id, str) else str(site_id).strip()
+                fields = [None if isinstance(v, str) and not v.strip() else v for v in fields]
+                site_rows[site_id].append((row, *fields))
+                
+                # _FILL_SPECS positions include the leading row number, which fields does not
+                if not has_empty and any(fields[target - 1] is None for target, _ in _FILL_SPECS):
+                    has_empty = True
+        
+        return site_rows, has_empty
 
 
 # ============================================================================
@@ -851,6 +904,12 @@ class UpdateResult:
     skipped: int
 
 
+@lru_cache(maxsize=1024)
+def _parse_ddmmyyyy(date_str: str) -> datetime:
+    """Parse a DD/MM/YYYY date; entries in one batch mostly share a few dates"""
+    return datetime.strptime(date_str, "%d/%m/%Y")
+
+
 class DataUpdater:
     """Updates Excel sheets with parsed data"""
     
@@ -859,16 +918,17 @@ class DataUpdater:
         self.excel_manager = ExcelManager(config)
     
     def update_excel(self,
-                     entries: List[Dict],
-                     error_logger: Optional[Callable] = None,
-                     progress_callback: Optional[Callable] = None) -> UpdateResult:
-        """Update Excel file with new entries"""
+                     entries: Iterable[Dict],
+                     error_logger: Optional[Callable] = None) -> UpdateResult:
+        """Update Excel file with new entries (a list, or any iterable such as a parser stream)"""
         
-        if not entries:
+        entries = iter(entries)
+        first_entry = next(entries, None)
+        if first_entry is None:
             logging.warning("⚠️ No entries to add.")
             return UpdateResult(added=0, faulty=0, skipped=0)
+        entries = chain([first_entry], entries)
         
-        self.excel_manager.backup_file()
         wb = self.excel_manager.load_workbook()
         
         # Load sheet information
@@ -882,6 +942,8 @@ class DataUpdater:
             
             if info:
                 info = self.excel_manager.ensure_column_exists(info, "NAME OF TECHNICIAN")
+                info.next_write_row = self.excel_manager.find_last_data_row(ws, info.col_map["SITE ID"]) + 1
+                info.append_rows = info.next_write_row > ws.max_row
                 sheet_cache[sheet_name] = info
         
         if not sheet_cache:
@@ -892,13 +954,8 @@ class DataUpdater:
         added = 0
         faulty = 0
         skipped = 0
-        total_entries = len(entries)
         
-        for entry_idx, entry in enumerate(entries):
-            if progress_callback:
-                progress = int((entry_idx / total_entries) * 30) + 60
-                progress_callback(progress)
-            
+        for entry in entries:
             result = self._process_entry(entry, sheet_cache, error_logger)
             
             if result == 'added':
@@ -908,8 +965,13 @@ class DataUpdater:
             elif result == 'skipped':
                 skipped += 1
         
-        wb.save(self.config.excel_file)
-        logging.info(f"💾 Excel file saved successfully")
+        # Back up and save only if rows were written
+        if added or faulty:
+            self.excel_manager.backup_file()
+            wb.save(self.config.excel_file)
+            logging.info(f"💾 Excel file saved successfully")
+        else:
+            logging.info("✅ No new rows, Excel file left unchanged")
         logging.info(f"📊 Final Summary: {added} added | {faulty} faulty | {skipped} skipped")
         
         return UpdateResult(added=added, faulty=faulty, skipped=skipped)
@@ -939,10 +1001,11 @@ class DataUpdater:
             # Don't skip - we're allowing entries without dates now
         else:
             try:
-                entry_date = datetime.strptime(entry["CURRENT VISIT DATE"], "%d/%m/%Y")
-                if entry_date <= info.last_date:
+                date_str = entry["CURRENT VISIT DATE"]
+                # The last recorded date itself needs no parsing
+                if date_str == info.last_date_str or _parse_ddmmyyyy(date_str) <= info.last_date:
                     if error_logger:
-                        error_logger(f"❌ Skipped {site_id}: Date {entry['CURRENT VISIT DATE']} is before or equal to last date {info.last_date.strftime('%d/%m/%Y')}")
+                        error_logger(f"❌ Skipped {site_id}: Date {date_str} is before or equal to last date {info.last_date_str}")
                     return 'skipped'
             except ValueError:
                 if error_logger:
@@ -961,13 +1024,18 @@ class DataUpdater:
             return 'skipped'
         
         # Write row
-        row_data = [entry.get(col, "") for col in info.headers]
-        last_data_row = self.excel_manager.find_last_data_row(info.worksheet, info.col_map["SITE ID"])
-        start_row = last_data_row + 1
+        # Missing fields are written as empty strings; map() keeps the lookups out of Python bytecode
+        row_data = list(map(entry.get, info.headers, repeat("")))
         
-        for j, value in enumerate(row_data):
-            info.worksheet.cell(row=start_row, column=j + 1, value=value)
+        if info.append_rows:
+            info.worksheet.append(row_data)
+        else:
+            # Rows below the data (e.g. pre-filled formulas) would make append() skip past them
+            start_row = info.next_write_row
+            for j, value in enumerate(row_data):
+                info.worksheet.cell(row=start_row, column=j + 1, value=value)
         
+        info.next_write_row += 1
         info.existing_keys.add(key)
         logging.info(f"✅ Added: {site_id} to {sheet_name}")
         
@@ -997,29 +1065,44 @@ class UnmatchedBlockExporter:
         with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
             writer.writerow(['Block Number', 'Reason', 'Preview (first 100 chars)', 'Full Content'])
-            
-            for idx, block_info in enumerate(unmatched_blocks, 1):
-                reason = block_info['reason']
-                content = block_info['content']
-                preview = content[:100].replace('\n', ' ')
-                writer.writerow([idx, reason, preview, content])
+            writer.writerows(
+                (idx, block_info['reason'], block_info['content'][:100].replace('\n', ' '), block_info['content'])
+                for idx, block_info in enumerate(unmatched_blocks, 1)
+            )
         
         logging.info(f"📄 Unmatched blocks saved to: {csv_path.name}")
 
 
 class GUILogger(logging.Handler):
-    """Custom logging handler for GUI text widget"""
+    """Custom logging handler for GUI text widget, flushed in batches from the Tk event loop"""
+    
+    FLUSH_INTERVAL_MS = 100
     
     def __init__(self, text_widget):
         super().__init__()
         self.text_widget = text_widget
+        self._buf = []
+        self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
     
     def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, msg + "\n")
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state='disabled')
+        # Called with the handler lock held
+        self._buf.append(self.format(record))
+    
+    def _flush(self):
+        """Write buffered messages to the widget in a single insert"""
+        self.acquire()
+        try:
+            messages, self._buf = self._buf, []
+        finally:
+            self.release()
+        
+        if messages:
+            self.text_widget.configure(state='normal')
+            self.text_widget.insert(tk.END, "\n".join(messages) + "\n")
+            self.text_widget.see(tk.END)
+            self.text_widget.configure(state='disabled')
+        
+        self.text_widget.after(self.FLUSH_INTERVAL_MS, self._flush)
 
 
 # ============================================================================
@@ -1029,6 +1112,9 @@ class GUILogger(logging.Handler):
 class AutomationController:
     """Main controller for the automation process"""
     
+    # Parsed entries waiting for the Excel updater; bounds memory on large chat files
+    ENTRY_QUEUE_SIZE = 1024
+    
     def __init__(self, config: Config):
         self.config = config
         self.parser = MessageParser(config)
@@ -1042,27 +1128,69 @@ class AutomationController:
             progress_callback: Optional[Callable] = None) -> Tuple[UpdateResult, int]:
         """Run the complete automation process"""
         
-        # Parse messages
+        # Parse messages in a background thread, handing entries over through a bounded queue
         logging.info("⏳ Parsing WhatsApp messages...")
-        parse_result = self.parser.parse_file(chat_file, error_logger, progress_callback)
+        entry_queue = queue.Queue(maxsize=self.ENTRY_QUEUE_SIZE)
+        unmatched_blocks = []
+        parse_errors = []
         
-        if not parse_result.entries:
-            logging.warning("⚠️ No valid entries found to process")
-            return UpdateResult(added=0, faulty=0, skipped=0), parse_result.skipped_count
+        # Parsing and updating overlap, so one 20-90% range follows the parser's block count.
+        # The parser thread only records it; the callback is invoked from this thread.
+        parse_progress = [20]
         
-        # Export unmatched blocks
-        if parse_result.unmatched_blocks:
-            self.exporter.export(parse_result.unmatched_blocks)
+        def record_progress(progress: int):
+            parse_progress[0] = progress
         
-        # Update Excel
+        def produce():
+            try:
+                for entry in self.parser.iter_entries(chat_file, error_logger, record_progress,
+                                                      unmatched_blocks.append, progress_range=(20, 90)):
+                    entry_queue.put(entry)
+            except Exception as e:
+                parse_errors.append(e)
+            finally:
+                entry_queue.put(None)
+        
+        def consume():
+            last_progress = None
+            while True:
+                entry = entry_queue.get()
+                if progress_callback and parse_progress[0] != last_progress:
+                    last_progress = parse_progress[0]
+                    progress_callback(last_progress)
+                if entry is None:
+                    # A parser failure must not look like the end of input, or the partial batch is saved
+                    if parse_errors:
+                        raise parse_errors[0]
+                    return
+                yield entry
+        
+        parser_thread = threading.Thread(target=produce, daemon=True)
+        parser_thread.start()
+        
+        # Update Excel while parsing continues
         logging.info("💾 Updating Excel file...")
-        update_result = self.updater.update_excel(
-            parse_result.entries, 
-            error_logger, 
-            progress_callback
-        )
+        entries = consume()
+        try:
+            update_result = self.updater.update_excel(entries, error_logger)
+        finally:
+            # Drain anything the updater did not take so the parser thread can finish. The queue
+            # is read directly because consume() is closed if it raised while being iterated.
+            while parser_thread.is_alive():
+                try:
+                    entry_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            parser_thread.join()
+            
+            # Export unmatched blocks even if the update failed, so they are not lost
+            if unmatched_blocks:
+                self.exporter.export(unmatched_blocks)
         
-        return update_result, parse_result.skipped_count
+        if parse_errors:
+            raise parse_errors[0]
+        
+        return update_result, len(unmatched_blocks)
     
     def run_propagation(self,
                        progress_callback: Optional[Callable] = None) -> PropagationResult:
@@ -1264,9 +1392,14 @@ class AutomationGUI:
                 f"  • Faulty entries: {update_result.faulty}\n"
                 f"  • Skipped entries: {skipped_parse + update_result.skipped}\n\n"
                 f"📁 Files:\n"
-                f"  • Backup: {self.config.backup_dir}/\n"
             )
             
+            # The Excel file is only backed up when rows were written to it
+            if update_result.added + update_result.faulty > 0:
+                summary += f"  • Backup: {self.config.backup_dir}/\n"
+            else:
+                summary += f"  • Excel file unchanged, no backup needed\n"
+            
             if skipped_parse > 0:
                 summary += f"  • Unmatched blocks CSV: {self.config.unmatched_dir}/\n"
             
@@ -1311,10 +1444,16 @@ class AutomationGUI:
                 f"  • Previous dates filled: {result.dates_filled}\n"
                 f"  • Previous diesel levels filled: {result.diesel_levels_filled}\n"
                 f"  • Previous DG run hours filled: {result.dg_hours_filled}\n\n"
-                f"📁 Backup created in: {self.config.backup_dir}/\n"
-                f"\n⏱️ Time taken: {int(elapsed)}s"
             )
             
+            # The Excel file is only backed up when cells were filled
+            if result.dates_filled + result.diesel_levels_filled + result.dg_hours_filled > 0:
+                summary += f"📁 Backup created in: {self.config.backup_dir}/\n"
+            else:
+                summary += f"📁 Excel file unchanged, no backup needed\n"
+            
+            summary += f"\n⏱️ Time taken: {int(elapsed)}s"
+            
             messagebox.showinfo("Success", summary)
             
         except FileNotFoundError:
@@ -1353,7 +1492,7 @@ class AutomationGUI:
             "• Previous Diesel Levels\n"
             "• Previous DG Run Hours\n\n"
             "For all sites in the Excel file.\n\n"
-            "A backup will be created first.\n\n"
+            "A backup will be created before any changes are saved.\n\n"
             "Continue?"
         )
         